@@ -6,26 +6,31 @@ import (
 	"encoding/hex"
 	"encoding/json"
 	"fmt"
+	"io"
 	"io/fs"
 	"os"
 	"os/exec"
 	"os/signal"
 	"path/filepath"
 	"regexp"
+	"runtime"
 	"sort"
+	"strconv"
 	"strings"
 	"sync"
 	"syscall"
 	"time"
+	"unicode"
 )
 
 var Version = "dev" // Set at build time via ldflags
 
-// Pre-compiled regex patterns for section parsing
+// Pre-compiled regex patterns for INDEX parsing
 var (
-	sectionOpenPattern  = regexp.MustCompile(`^\{#([a-zA-Z][a-zA-Z0-9_-]*)\}`)
-	sectionClosePattern = regexp.MustCompile(`^\{/([a-zA-Z][a-zA-Z0-9_-]*)\}`)
-	referencePattern    = regexp.MustCompile(`\{@([a-zA-Z][a-zA-Z0-9_-]*)\}`)
+	indexEntryIDPattern    = regexp.MustCompile(`^#{1,6}\s+.*\{#([a-zA-Z][a-zA-Z0-9_-]*)\s*\|`)
+	indexEntryTitlePattern = regexp.MustCompile(`^#{1,6}\s+(.+)\s*\{#([a-zA-Z][a-zA-Z0-9_-]*)\s*\|.*\}$`)
+	indexEntryRangePattern = regexp.MustCompile(`^#{1,6}\s+.*\{#([a-zA-Z][a-zA-Z0-9_-]*)\s*\|\s*lines:(\d+)-(\d+)[^}]*\}$`)
+	contentHashPattern     = regexp.MustCompile(`^<!-- Content-Hash:\s*([a-z0-9]+):([a-f0-9]+)\s*-->$`)
 )
 
 type Section struct {
@@ -54,10 +59,9 @@ func validateNesting(lines []string, contentStart int) error {
 	openSections := []string{}
 
 	for _, line := range lines[contentStart:] {
-		if match := sectionOpenPattern.FindStringSubmatch(line); match != nil {
-			openSections = append(openSections, match[1])
-		} else if match := sectionClosePattern.FindStringSubmatch(line); match != nil {
-			id := match[1]
+		if id, ok := parseSectionTag(line, '#'); ok {
+			openSections = append(openSections, id)
+		} else if id, ok := parseSectionTag(line, '/'); ok {
 			if len(openSections) > 0 && openSections[len(openSections)-1] == id {
 				openSections = openSections[:len(openSections)-1]
 			} else {
@@ -73,20 +77,44 @@ func validateNesting(lines []string, contentStart int) error {
 	return nil
 }
 
+// parseSectionTag returns the ID of a tag at the start of line: {#id} when
+// marker is '#', {/id} when marker is '/', {@id} when marker is '@'. IDs
+// follow [a-zA-Z][a-zA-Z0-9_-]*; anything after the closing brace is ignored.
+func parseSectionTag(line string, marker byte) (string, bool) {
+	if len(line) < 4 || line[0] != '{' || line[1] != marker {
+		return "", false
+	}
+	if c := line[2]; !('a' <= c && c <= 'z' || 'A' <= c && c <= 'Z') {
+		return "", false
+	}
+	for i := 3; i < len(line); i++ {
+		c := line[i]
+		switch {
+		case c == '}':
+			return line[2:i], true
+		case 'a' <= c && c <= 'z', 'A' <= c && c <= 'Z', '0' <= c && c <= '9', c == '_', c == '-':
+		default:
+			return "", false
+		}
+	}
+	return "", false
+}
+
 func isCodeFenceLine(line string) bool {
 	return strings.TrimSpace(line) == "```"
 }
 
 // ReferenceLocation stores information about where a reference was found
 type ReferenceLocation struct {
+	Target            string
 	LineNum           int
 	ContainingSection string
 }
 
 // extractReferences extracts all {@section-id} references from content, ignoring fenced code blocks.
-// Returns a map of section_id -> list of ReferenceLocation where it's referenced.
-func extractReferences(lines []string, contentStart int) map[string][]ReferenceLocation {
-	references := make(map[string][]ReferenceLocation)
+// Returns references ordered by line, then by target within a line.
+func extractReferences(lines []string, contentStart int) []ReferenceLocation {
+	references := []ReferenceLocation{}
 	openSections := []string{}
 	inCodeFence := false
 
@@ -105,12 +133,12 @@ func extractReferences(lines []string, contentStart int) map[string][]ReferenceL
 			continue
 		}
 
-		if match := sectionOpenPattern.FindStringSubmatch(line); match != nil {
-			openSections = append(openSections, match[1])
+		if id, ok := parseSectionTag(line, '#'); ok {
+			openSections = append(openSections, id)
 			continue
 		}
-		if match := sectionClosePattern.FindStringSubmatch(line); match != nil {
-			if len(openSections) > 0 && openSections[len(openSections)-1] == match[1] {
+		if id, ok := parseSectionTag(line, '/'); ok {
+			if len(openSections) > 0 && openSections[len(openSections)-1] == id {
 				openSections = openSections[:len(openSections)-1]
 			} else {
 				openSections = []string{}
@@ -118,17 +146,34 @@ func extractReferences(lines []string, contentStart int) map[string][]ReferenceL
 			continue
 		}
 
-		matches := referencePattern.FindAllStringSubmatch(line, -1)
-		for _, match := range matches {
-			target := match[1]
-			containingSection := ""
-			if len(openSections) > 0 {
-				containingSection = openSections[len(openSections)-1]
+		containingSection := ""
+		if len(openSections) > 0 {
+			containingSection = openSections[len(openSections)-1]
+		}
+		// Scan each "{@" occurrence for a {@id} reference; most lines have none
+		lineStart := len(references)
+		for rest := line; ; {
+			pos := strings.Index(rest, "{@")
+			if pos < 0 {
+				break
+			}
+			rest = rest[pos:]
+			target, ok := parseSectionTag(rest, '@')
+			if !ok {
+				rest = rest[2:]
+				continue
 			}
-			references[target] = append(references[target], ReferenceLocation{
+			references = append(references, ReferenceLocation{
+				Target:            target,
 				LineNum:           lineNum,
 				ContainingSection: containingSection,
 			})
+			rest = rest[len(target)+3:]
+		}
+		if lineRefs := references[lineStart:]; len(lineRefs) > 1 {
+			sort.SliceStable(lineRefs, func(i, j int) bool {
+				return lineRefs[i].Target < lineRefs[j].Target
+			})
 		}
 	}
 
@@ -146,38 +191,11 @@ func validateReferences(lines []string, contentStart int, sections []Section) []
 		validIDs[section.ID] = true
 	}
 
-	// Extract references
+	// Extract references (already in line order)
 	references := extractReferences(lines, contentStart)
 
-	type referenceInstance struct {
-		Target            string
-		LineNum           int
-		ContainingSection string
-	}
-
-	orderedRefs := []referenceInstance{}
-	for target, locations := range references {
-		for _, loc := range locations {
-			orderedRefs = append(orderedRefs, referenceInstance{
-				Target:            target,
-				LineNum:           loc.LineNum,
-				ContainingSection: loc.ContainingSection,
-			})
-		}
-	}
-
-	sort.Slice(orderedRefs, func(i, j int) bool {
-		if orderedRefs[i].LineNum != orderedRefs[j].LineNum {
-			return orderedRefs[i].LineNum < orderedRefs[j].LineNum
-		}
-		if orderedRefs[i].Target != orderedRefs[j].Target {
-			return orderedRefs[i].Target < orderedRefs[j].Target
-		}
-		return orderedRefs[i].ContainingSection < orderedRefs[j].ContainingSection
-	})
-
 	// Validate each reference in deterministic order
-	for _, ref := range orderedRefs {
+	for _, ref := range references {
 		if !validIDs[ref.Target] {
 			errors = append(errors, fmt.Sprintf("Reference {@%s} at line %d: target section does not exist", ref.Target, ref.LineNum))
 		} else if ref.Target == ref.ContainingSection {
@@ -223,11 +241,13 @@ func main() {
 		}
 		os.Exit(rebuildCommand(os.Args[2]))
 	case "rebuild-all":
-		directory := "."
-		if len(os.Args) >= 3 {
-			directory = os.Args[2]
+		directory, jobs, force, err := parseRebuildAllArgs(os.Args[2:])
+		if err != nil {
+			fmt.Fprintf(os.Stderr, "Error: %v\n", err)
+			fmt.Fprintln(os.Stderr, "Usage: iatf rebuild-all [directory] [--jobs N] [--force]")
+			os.Exit(1)
 		}
-		os.Exit(rebuildAllCommand(directory))
+		os.Exit(rebuildAllCommand(directory, jobs, force))
 	case "watch":
 		if len(os.Args) >= 3 && os.Args[2] == "--list" {
 			os.Exit(listWatched())
@@ -257,10 +277,10 @@ func main() {
 	case "validate":
 		if len(os.Args) < 3 {
 			fmt.Fprintln(os.Stderr, "Error: Missing file argument")
-			fmt.Fprintln(os.Stderr, "Usage: iatf validate <file>")
+			fmt.Fprintln(os.Stderr, "Usage: iatf validate <file>...")
 			os.Exit(1)
 		}
-		os.Exit(validateCommand(os.Args[2]))
+		os.Exit(validateFilesCommand(os.Args[2:]))
 	case "index":
 		if len(os.Args) < 3 {
 			fmt.Fprintln(os.Stderr, "Error: Missing file argument")
@@ -336,12 +356,12 @@ func printUsage() {
 
 Usage:
     iatf rebuild <file>              Rebuild index for a single file
-    iatf rebuild-all [directory]     Rebuild all .iatf files in directory
+    iatf rebuild-all [dir] [--jobs N] [--force]  Rebuild all .iatf files in directory
     iatf watch <file> [--debug]      Watch file and auto-rebuild on changes
     iatf watch-dir <dir> [--debug]   Watch directory tree for .iatf files
     iatf unwatch <file>              Stop watching a file
     iatf watch --list                List all watched files
-    iatf validate <file>             Validate iatf file structure
+    iatf validate <file>...          Validate one or more iatf files
     iatf index <file>                Output INDEX section only
     iatf read <file> <section-id>    Extract section by ID
     iatf read <file> --title "Title" Extract section by title
@@ -364,6 +384,7 @@ Examples:
     iatf watch api-reference.iatf --debug
     iatf watch-dir ./docs
     iatf validate my-doc.iatf
+    iatf validate docs/*.iatf
     iatf index document.iatf
     iatf read document.iatf intro
     iatf read document.iatf --title "Introduction"
@@ -374,83 +395,149 @@ For more information, visit: https://github.com/Winds-AI/agent-traversal-file
 `, Version)
 }
 
+// openSection tracks a section whose closing tag has not been seen yet
+type openSection struct {
+	idx                 int  // index into sections
+	inHeader            bool // still reading @metadata lines
+	summaryContinuation bool // indented lines extend @summary
+}
+
 func parseContentSection(lines []string, contentStart int) []Section {
+	sections, _ := parseContentSectionChecked(lines, contentStart)
+	return sections
+}
+
+// parseContentSectionChecked parses CONTENT and also reports the first
+// nesting error, matching validateNesting, so callers that need both avoid a
+// second walk over the file.
+func parseContentSectionChecked(lines []string, contentStart int) ([]Section, error) {
 	sections := []Section{}
-	stack := []int{}
-	inHeader := []bool{}
-	summaryContinuation := []bool{}
+	stack := []openSection{}
+	var nestingErr error
 
 	for i := contentStart; i < len(lines); i++ {
 		line := lines[i]
 
-		if match := sectionOpenPattern.FindStringSubmatch(line); match != nil {
-			section := Section{
-				ID:    match[1],
-				Title: match[1],
-				Start: i + 1, // 1-indexed
-				Level: len(stack) + 1,
+		// Dispatch on the first byte so plain content lines skip the tag regexes
+		var first byte
+		if len(line) > 0 {
+			first = line[0]
+		}
+
+		if first == '{' {
+			if id, ok := parseSectionTag(line, '#'); ok {
+				section := Section{
+					ID:    id,
+					Title: id,
+					Start: i + 1, // 1-indexed
+					Level: len(stack) + 1,
+				}
+				sections = append(sections, section)
+				stack = append(stack, openSection{idx: len(sections) - 1, inHeader: true})
+				continue
 			}
-			sections = append(sections, section)
-			stack = append(stack, len(sections)-1)
-			inHeader = append(inHeader, true)
-			summaryContinuation = append(summaryContinuation, false)
-			continue
 		}
 
-		if len(stack) > 0 && inHeader[len(inHeader)-1] {
-			if strings.HasPrefix(line, "@") {
-				if strings.HasPrefix(line, "@summary:") {
-					sections[stack[len(stack)-1]].Summary = strings.TrimSpace(line[9:])
-					summaryContinuation[len(summaryContinuation)-1] = true
-				} else if strings.HasPrefix(line, "@created:") {
-					// @created is stored in INDEX, not CONTENT
-					summaryContinuation[len(summaryContinuation)-1] = false
+		var top *openSection
+		if len(stack) > 0 {
+			top = &stack[len(stack)-1]
+		}
+
+		if top != nil && top.inHeader {
+			if first == '@' {
+				key, value, found := strings.Cut(line, ":")
+				if found {
+					switch key {
+					case "@summary":
+						sections[top.idx].Summary = strings.TrimSpace(value)
+						top.summaryContinuation = true
+					case "@created":
+						// @created is stored in INDEX, not CONTENT
+						top.summaryContinuation = false
+					}
 				}
 				continue
 			}
-			if (strings.HasPrefix(line, " ") || strings.HasPrefix(line, "\t")) && summaryContinuation[len(summaryContinuation)-1] {
-				sections[stack[len(stack)-1]].Summary = fmt.Sprintf(
+			if (first == ' ' || first == '\t') && top.summaryContinuation {
+				sections[top.idx].Summary = fmt.Sprintf(
 					"%s %s",
-					sections[stack[len(stack)-1]].Summary,
+					sections[top.idx].Summary,
 					strings.TrimSpace(line),
 				)
 				continue
 			}
-			inHeader[len(inHeader)-1] = false
-			summaryContinuation[len(summaryContinuation)-1] = false
+			top.inHeader = false
+			top.summaryContinuation = false
 		}
 
-		if match := sectionClosePattern.FindStringSubmatch(line); match != nil {
-			if len(stack) > 0 && sections[stack[len(stack)-1]].ID == match[1] {
-				idx := stack[len(stack)-1]
-				sections[idx].End = i + 1 // 1-indexed
-				stack = stack[:len(stack)-1]
-				inHeader = inHeader[:len(inHeader)-1]
-				summaryContinuation = summaryContinuation[:len(summaryContinuation)-1]
+		if first == '{' {
+			if id, ok := parseSectionTag(line, '/'); ok {
+				if top != nil && sections[top.idx].ID == id {
+					sections[top.idx].End = i + 1 // 1-indexed
+					stack = stack[:len(stack)-1]
+				} else if nestingErr == nil {
+					nestingErr = fmt.Errorf("closing tag without matching opening: %s", id)
+				}
+				continue
 			}
-			continue
 		}
 
-		if len(stack) > 0 && !inHeader[len(inHeader)-1] {
-			if strings.HasPrefix(line, "#") && !strings.HasPrefix(sections[stack[len(stack)-1]].Title, "#") {
-				sections[stack[len(stack)-1]].Title = strings.TrimSpace(strings.TrimLeft(line, "#"))
+		if top != nil && !top.inHeader {
+			section := &sections[top.idx]
+			if first == '#' && !strings.HasPrefix(section.Title, "#") {
+				section.Title = strings.TrimSpace(strings.TrimLeft(line, "#"))
 			}
-			sections[stack[len(stack)-1]].ContentLines = append(sections[stack[len(stack)-1]].ContentLines, line)
+			section.ContentLines = append(section.ContentLines, line)
 		}
 	}
 
-	return sections
+	if nestingErr == nil && len(stack) > 0 {
+		nestingErr = fmt.Errorf("unclosed section: %s", sections[stack[len(stack)-1].idx].ID)
+	}
+
+	return sections, nestingErr
 }
 
+// computeContentHash returns the short SHA-256 of contentLines joined with
+// newlines, feeding the hasher through a small buffer instead of building
+// the joined text.
 func computeContentHash(contentLines []string) string {
-	contentText := strings.Join(contentLines, "\n")
-	sum := sha256.Sum256([]byte(contentText))
-	return hex.EncodeToString(sum[:])[:7]
+	h := sha256.New()
+	buf := make([]byte, 0, 4096)
+	for i, line := range contentLines {
+		if i > 0 {
+			buf = append(buf, '\n')
+		}
+		if len(buf)+len(line) > cap(buf) {
+			h.Write(buf)
+			buf = buf[:0]
+			if len(line) > cap(buf) {
+				io.WriteString(h, line)
+				continue
+			}
+		}
+		buf = append(buf, line...)
+	}
+	h.Write(buf)
+	return hex.EncodeToString(h.Sum(nil))[:7]
 }
 
+// countWords counts whitespace-separated words (as strings.Fields would)
+// line by line, without joining the lines or allocating the words.
 func countWords(contentLines []string) int {
-	text := strings.Join(contentLines, " ")
-	return len(strings.Fields(text))
+	count := 0
+	for _, line := range contentLines {
+		inWord := false
+		for _, r := range line {
+			if unicode.IsSpace(r) {
+				inWord = false
+			} else if !inWord {
+				inWord = true
+				count++
+			}
+		}
+	}
+	return count
 }
 
 type indexMeta struct {
@@ -459,23 +546,62 @@ type indexMeta struct {
 	Created  string
 }
 
-func parseIndexMetadata(lines []string) map[string]indexMeta {
-	indexStart := -1
-	indexEnd := -1
+// fileMarkers records the line positions of the structural markers in an
+// IATF file. Positions are -1 when the marker is absent.
+type fileMarkers struct {
+	IndexStart   int // last ===INDEX=== line before CONTENT
+	ContentStart int // first ===CONTENT=== line
+	HeaderEnd    int // line after :::IATF and its @metadata lines
+}
+
+// findMarkers scans lines once and returns the positions of the INDEX,
+// CONTENT and header markers.
+func findMarkers(lines []string) fileMarkers {
+	m := fileMarkers{IndexStart: -1, ContentStart: -1, HeaderEnd: -1}
+	for i := 0; i < len(lines); i++ {
+		stripped := strings.TrimSpace(lines[i])
+		if m.HeaderEnd == -1 && stripped == ":::IATF" {
+			// Skip metadata lines
+			for i+1 < len(lines) && strings.HasPrefix(lines[i+1], "@") {
+				i++
+			}
+			m.HeaderEnd = i + 1
+			continue
+		}
+		if m.ContentStart != -1 {
+			if m.HeaderEnd != -1 {
+				break
+			}
+			continue
+		}
+		if stripped == "===INDEX===" {
+			m.IndexStart = i
+		} else if stripped == "===CONTENT===" {
+			m.ContentStart = i
+		}
+	}
+	return m
+}
+
+// findMarkerPositions returns every ===INDEX=== and ===CONTENT=== line,
+// for validators that must report duplicate or misplaced markers.
+func findMarkerPositions(lines []string) (indexPositions, contentPositions []int) {
 	for i, line := range lines {
-		if strings.TrimSpace(line) == "===INDEX===" {
-			indexStart = i
-		} else if strings.TrimSpace(line) == "===CONTENT===" {
-			indexEnd = i
-			break
+		switch strings.TrimSpace(line) {
+		case "===INDEX===":
+			indexPositions = append(indexPositions, i)
+		case "===CONTENT===":
+			contentPositions = append(contentPositions, i)
 		}
 	}
+	return indexPositions, contentPositions
+}
 
+func parseIndexMetadata(lines []string, indexStart, indexEnd int) map[string]indexMeta {
 	if indexStart == -1 || indexEnd == -1 {
 		return map[string]indexMeta{}
 	}
 
-	entryRe := regexp.MustCompile(`^#{1,6}\s+.*\{#([a-zA-Z][a-zA-Z0-9_-]*)\s*\|`)
 	metadata := map[string]indexMeta{}
 	currentID := ""
 
@@ -486,35 +612,44 @@ func parseIndexMetadata(lines []string) map[string]indexMeta {
 			continue
 		}
 
-		if match := entryRe.FindStringSubmatch(stripped); match != nil {
-			currentID = match[1]
-			if _, exists := metadata[currentID]; !exists {
-				metadata[currentID] = indexMeta{}
+		if stripped[0] == '#' {
+			if match := indexEntryIDPattern.FindStringSubmatch(stripped); match != nil {
+				currentID = match[1]
+				if _, exists := metadata[currentID]; !exists {
+					metadata[currentID] = indexMeta{}
+				}
+				continue
 			}
-			continue
 		}
 
 		if currentID == "" {
 			continue
 		}
 
-		if strings.HasPrefix(stripped, "Hash:") {
-			meta := metadata[currentID]
-			meta.Hash = strings.TrimSpace(strings.TrimPrefix(stripped, "Hash:"))
-			metadata[currentID] = meta
+		// Metadata lines are "Hash: x" or "Created: x | Modified: y"
+		key, value, found := strings.Cut(stripped, ":")
+		if !found {
 			continue
 		}
-
-		if strings.HasPrefix(stripped, "Created:") || strings.HasPrefix(stripped, "Modified:") {
-			parts := strings.Split(stripped, "|")
+		switch key {
+		case "Hash":
+			meta := metadata[currentID]
+			meta.Hash = strings.TrimSpace(value)
+			metadata[currentID] = meta
+		case "Created", "Modified":
 			meta := metadata[currentID]
-			for _, part := range parts {
-				part = strings.TrimSpace(part)
-				if strings.HasPrefix(part, "Created:") {
-					meta.Created = strings.TrimSpace(strings.TrimPrefix(part, "Created:"))
+			for rest := stripped; rest != ""; {
+				var part string
+				part, rest, _ = strings.Cut(rest, "|")
+				field, fieldValue, ok := strings.Cut(strings.TrimSpace(part), ":")
+				if !ok {
+					continue
 				}
-				if strings.HasPrefix(part, "Modified:") {
-					meta.Modified = strings.TrimSpace(strings.TrimPrefix(part, "Modified:"))
+				switch field {
+				case "Created":
+					meta.Created = strings.TrimSpace(fieldValue)
+				case "Modified":
+					meta.Modified = strings.TrimSpace(fieldValue)
 				}
 			}
 			metadata[currentID] = meta
@@ -524,38 +659,85 @@ func parseIndexMetadata(lines []string) map[string]indexMeta {
 	return metadata
 }
 
-func generateIndex(sections []Section, contentHash string) []string {
-	indexLines := []string{
+// indexGeneratedLine is the position of the Generated comment in generateIndex output.
+const indexGeneratedLine = 2
+
+func formatGeneratedLine(generated string) string {
+	return fmt.Sprintf("<!-- Generated: %s -->", generated)
+}
+
+// findGeneratedStamp returns the timestamp from an existing INDEX's Generated comment.
+func findGeneratedStamp(indexLines []string) string {
+	for _, line := range indexLines {
+		stripped := strings.TrimSpace(line)
+		if strings.HasPrefix(stripped, "<!-- Generated:") && strings.HasSuffix(stripped, "-->") {
+			return strings.TrimSpace(stripped[len("<!-- Generated:") : len(stripped)-len("-->")])
+		}
+	}
+	return ""
+}
+
+// indexLineCount returns the number of lines generateIndex emits for sections,
+// so line numbers can be adjusted before the INDEX is rendered.
+func indexLineCount(sections []Section) int {
+	count := 5 // marker, two comments, Content-Hash, blank
+	for _, section := range sections {
+		count += 2 // entry line and trailing blank
+		if section.Summary != "" {
+			count++
+		}
+		if section.Created != "" || section.Modified != "" {
+			count++
+		}
+		if section.XHash != "" {
+			count++
+		}
+	}
+	return count
+}
+
+// levelMarkers holds the INDEX heading prefixes; levelMarker slices it so
+// common levels need no allocation.
+const levelMarkers = "######"
+
+func levelMarker(level int) string {
+	if level <= len(levelMarkers) {
+		return levelMarkers[:level]
+	}
+	return strings.Repeat("#", level)
+}
+
+// generateIndex renders the INDEX block; keep indexLineCount in step with it.
+func generateIndex(sections []Section, contentHash string, generated string) []string {
+	indexLines := make([]string, 0, indexLineCount(sections))
+	indexLines = append(indexLines,
 		"===INDEX===",
 		"<!-- AUTO-GENERATED - DO NOT EDIT MANUALLY -->",
-		fmt.Sprintf("<!-- Generated: %s -->", time.Now().UTC().Format(time.RFC3339)),
+		formatGeneratedLine(generated),
 		fmt.Sprintf("<!-- Content-Hash: sha256:%s -->", contentHash),
 		"",
-	}
+	)
 
 	for _, section := range sections {
-		levelMarker := strings.Repeat("#", section.Level)
 		indexLine := fmt.Sprintf("%s %s {#%s | lines:%d-%d | words:%d}",
-			levelMarker, section.Title, section.ID, section.Start, section.End, section.WordCount)
+			levelMarker(section.Level), section.Title, section.ID, section.Start, section.End, section.WordCount)
 		indexLines = append(indexLines, indexLine)
 
 		if section.Summary != "" {
-			indexLines = append(indexLines, fmt.Sprintf("> %s", section.Summary))
+			indexLines = append(indexLines, "> "+section.Summary)
 		}
 
-		if section.Created != "" || section.Modified != "" {
-			timestamps := []string{}
-			if section.Created != "" {
-				timestamps = append(timestamps, fmt.Sprintf("Created: %s", section.Created))
-			}
-			if section.Modified != "" {
-				timestamps = append(timestamps, fmt.Sprintf("Modified: %s", section.Modified))
-			}
-			indexLines = append(indexLines, fmt.Sprintf("  %s", strings.Join(timestamps, " | ")))
+		switch {
+		case section.Created != "" && section.Modified != "":
+			indexLines = append(indexLines, "  Created: "+section.Created+" | Modified: "+section.Modified)
+		case section.Created != "":
+			indexLines = append(indexLines, "  Created: "+section.Created)
+		case section.Modified != "":
+			indexLines = append(indexLines, "  Modified: "+section.Modified)
 		}
 
 		if section.XHash != "" {
-			indexLines = append(indexLines, fmt.Sprintf("  Hash: %s", section.XHash))
+			indexLines = append(indexLines, "  Hash: "+section.XHash)
 		}
 
 		indexLines = append(indexLines, "")
@@ -564,6 +746,26 @@ func generateIndex(sections []Section, contentHash string) []string {
 	return indexLines
 }
 
+// rebuildError reports a rebuild that was refused because of content problems.
+// Details holds one message per problem so callers can print them where appropriate.
+type rebuildError struct {
+	msg     string
+	Details []string
+}
+
+func (e *rebuildError) Error() string {
+	return e.msg
+}
+
+// printRebuildDetails writes any per-problem details carried by a rebuild error.
+func printRebuildDetails(err error) {
+	if rebuildErr, ok := err.(*rebuildError); ok {
+		for _, detail := range rebuildErr.Details {
+			fmt.Fprintf(os.Stderr, "  - %s\n", detail)
+		}
+	}
+}
+
 func rebuildIndex(filePath string) error {
 	content, err := os.ReadFile(filePath)
 	if err != nil {
@@ -572,50 +774,46 @@ func rebuildIndex(filePath string) error {
 
 	lines := strings.Split(string(content), "\n")
 
-	// Find CONTENT section
-	contentStart := -1
-	for i, line := range lines {
-		if strings.TrimSpace(line) == "===CONTENT===" {
-			contentStart = i + 1
-			break
-		}
-	}
-
-	if contentStart == -1 {
+	// Locate INDEX, CONTENT and header markers in a single pass
+	markers := findMarkers(lines)
+	if markers.ContentStart == -1 {
 		return fmt.Errorf("no ===CONTENT=== section found")
 	}
+	contentStart := markers.ContentStart + 1
 
-	// Validate nesting before parsing for index rebuild (fail-fast approach)
-	if err := validateNesting(lines, contentStart); err != nil {
+	// Parse sections, rejecting invalid nesting before anything else
+	sections, err := parseContentSectionChecked(lines, contentStart)
+	if err != nil {
 		return fmt.Errorf("invalid section nesting: %w", err)
 	}
 
-	// Parse sections
-	sections := parseContentSection(lines, contentStart)
-
 	if len(sections) == 0 {
 		return fmt.Errorf("no sections found")
 	}
 
 	duplicateIDs := findDuplicateSectionIDs(sections)
 	if len(duplicateIDs) > 0 {
+		details := make([]string, 0, len(duplicateIDs))
 		for _, id := range duplicateIDs {
-			fmt.Fprintf(os.Stderr, "  - Duplicate section ID: %s\n", id)
+			details = append(details, fmt.Sprintf("Duplicate section ID: %s", id))
+		}
+		return &rebuildError{
+			msg:     fmt.Sprintf("%d duplicate section ID(s) found", len(duplicateIDs)),
+			Details: details,
 		}
-		return fmt.Errorf("%d duplicate section ID(s) found", len(duplicateIDs))
 	}
 
 	// Validate references before proceeding
 	refErrors := validateReferences(lines, contentStart, sections)
 	if len(refErrors) > 0 {
-		for _, err := range refErrors {
-			fmt.Fprintf(os.Stderr, "  - %s\n", err)
+		return &rebuildError{
+			msg:     fmt.Sprintf("%d reference error(s) found", len(refErrors)),
+			Details: refErrors,
 		}
-		return fmt.Errorf("%d reference error(s) found", len(refErrors))
 	}
 
 	// Parse existing INDEX metadata (hash/modified)
-	indexMeta := parseIndexMetadata(lines)
+	indexMeta := parseIndexMetadata(lines, markers.IndexStart, markers.ContentStart)
 
 	// Auto-update Modified based on content hash changes
 	today := time.Now().Format("2006-01-02")
@@ -650,88 +848,156 @@ func rebuildIndex(filePath string) error {
 	}
 
 	// Find where to insert INDEX
-	headerEnd := -1
-	indexEnd := -1
-
-	for i, line := range lines {
-		if strings.TrimSpace(line) == "===INDEX===" {
-			headerEnd = i
-		} else if strings.TrimSpace(line) == "===CONTENT===" {
-			indexEnd = i
-			break
-		}
-	}
-
-	if headerEnd == -1 {
+	headerEnd := markers.IndexStart
+	indexEnd := markers.ContentStart
+	hasIndex := headerEnd != -1
+	if !hasIndex {
 		// No existing INDEX, insert after header
-		for i, line := range lines {
-			if strings.TrimSpace(line) == ":::IATF" {
-				headerEnd = i + 1
-				// Skip metadata lines
-				for i+1 < len(lines) && strings.HasPrefix(lines[i+1], "@") {
-					i++
-					headerEnd = i + 1
-				}
-				break
-			}
-		}
+		headerEnd = markers.HeaderEnd
 	}
 
-	if headerEnd == -1 || indexEnd == -1 {
+	if headerEnd == -1 {
 		return fmt.Errorf("invalid iatf file format")
 	}
 
-	// Recalculate indexEnd before rebuild
-	indexEnd = -1
-	for i, line := range lines {
-		if strings.TrimSpace(line) == "===CONTENT===" {
-			indexEnd = i
-			break
-		}
+	// Recalculate content hash after updates (Git-style 7 chars), hashing
+	// the raw bytes after the CONTENT marker instead of re-joining lines
+	sum := sha256.Sum256(content[lineOffset(lines, contentStart):])
+	contentHash := hex.EncodeToString(sum[:])[:7]
+
+	// Render with the existing Generated stamp first so an unchanged file
+	// compares equal below; a fresh stamp is only applied when writing.
+	generated := time.Now().UTC().Format(time.RFC3339)
+	previousGenerated := ""
+	if hasIndex {
+		previousGenerated = findGeneratedStamp(lines[headerEnd:indexEnd])
 	}
-	if indexEnd == -1 {
-		return fmt.Errorf("===CONTENT=== section lost after metadata update")
+	stamp := generated
+	if previousGenerated != "" {
+		stamp = previousGenerated
 	}
 
-	// Recalculate content hash after updates (Git-style 7 chars)
-	contentText := strings.Join(lines[contentStart:], "\n")
-	sum := sha256.Sum256([]byte(contentText))
-	contentHash := hex.EncodeToString(sum[:])[:7]
-
-	// Generate new INDEX (two-pass to adjust absolute line numbers)
-	newIndex := generateIndex(sections, contentHash)
+	// Shift absolute line numbers by the change in INDEX size, then generate once
 	originalSpan := indexEnd - headerEnd
-	newSpan := len(newIndex) + 1 // index + blank
+	newSpan := indexLineCount(sections) + 1 // index + blank
 	lineDelta := newSpan - originalSpan
 	if lineDelta != 0 {
 		for i := range sections {
 			sections[i].Start += lineDelta
 			sections[i].End += lineDelta
 		}
-		newIndex = generateIndex(sections, contentHash)
 	}
+	newIndex := generateIndex(sections, contentHash, stamp)
 
 	// Rebuild file (normalize spacing around INDEX)
-	preLines := append([]string{}, lines[:headerEnd]...)
+	preLines := lines[:headerEnd]
 	for len(preLines) > 0 && strings.TrimSpace(preLines[len(preLines)-1]) == "" {
 		preLines = preLines[:len(preLines)-1]
 	}
 
-	postLines := append([]string{}, lines[indexEnd:]...)
+	postLines := lines[indexEnd:]
 	for len(postLines) > 0 && strings.TrimSpace(postLines[0]) == "" {
 		postLines = postLines[1:]
 	}
 
-	newLines := []string{}
+	newLines := make([]string, 0, len(preLines)+len(newIndex)+2+len(postLines))
 	newLines = append(newLines, preLines...)
 	newLines = append(newLines, "")
 	newLines = append(newLines, newIndex...)
 	newLines = append(newLines, "")
 	newLines = append(newLines, postLines...)
 
-	newContent := strings.Join(newLines, "\n")
+	// Skip the write when nothing but the timestamp would change; this keeps
+	// mtimes stable and stops watchers from re-triggering on their own output.
+	if previousGenerated != "" && equalLines(newLines, lines) {
+		return nil
+	}
+	newLines[len(preLines)+1+indexGeneratedLine] = formatGeneratedLine(generated)
+
+	return writeFileAtomic(filePath, joinLinesBytes(newLines))
+}
+
+// writeFileAtomic replaces filePath with data via a synced temp file in the
+// same directory and a rename, so an interrupted rebuild never leaves a
+// truncated file. Symlinks are followed and the existing permissions kept.
+func writeFileAtomic(filePath string, data []byte) error {
+	target, err := filepath.EvalSymlinks(filePath)
+	if err != nil {
+		return err
+	}
+	perm := os.FileMode(0644)
+	if info, err := os.Stat(target); err == nil {
+		perm = info.Mode().Perm()
+	}
+
+	tmp, err := os.CreateTemp(filepath.Dir(target), "."+filepath.Base(target)+".tmp-*")
+	if err != nil {
+		return err
+	}
+	tmpPath := tmp.Name()
+	defer os.Remove(tmpPath) // no-op once renamed
+
+	if _, err := tmp.Write(data); err != nil {
+		tmp.Close()
+		return err
+	}
+	if err := tmp.Chmod(perm); err != nil {
+		tmp.Close()
+		return err
+	}
+	if err := tmp.Sync(); err != nil {
+		tmp.Close()
+		return err
+	}
+	if err := tmp.Close(); err != nil {
+		return err
+	}
+	return os.Rename(tmpPath, target)
+}
+
+// joinLinesBytes joins lines with newlines into a single pre-sized buffer,
+// avoiding the intermediate string that strings.Join would produce.
+func joinLinesBytes(lines []string) []byte {
+	if len(lines) == 0 {
+		return nil
+	}
+	size := len(lines) - 1
+	for _, line := range lines {
+		size += len(line)
+	}
+	buf := make([]byte, 0, size)
+	for i, line := range lines {
+		if i > 0 {
+			buf = append(buf, '\n')
+		}
+		buf = append(buf, line...)
+	}
+	return buf
+}
+
+// lineOffset returns the byte offset of lines[n] in the content the lines
+// were split from on "\n", or the content length when n is past the end.
+func lineOffset(lines []string, n int) int {
+	offset := 0
+	for _, line := range lines[:n] {
+		offset += len(line) + 1
+	}
+	if n == len(lines) {
+		offset-- // no separator after the last line
+	}
+	return offset
+}
 
-	return os.WriteFile(filePath, []byte(newContent), 0644)
+func equalLines(a, b []string) bool {
+	if len(a) != len(b) {
+		return false
+	}
+	for i := range a {
+		if a[i] != b[i] {
+			return false
+		}
+	}
+	return true
 }
 
 func rebuildCommand(filePath string) int {
@@ -748,6 +1014,7 @@ func rebuildCommand(filePath string) int {
 	fmt.Printf("Rebuilding index: %s\n", filePath)
 
 	if err := rebuildIndex(filePath); err != nil {
+		printRebuildDetails(err)
 		fmt.Fprintf(os.Stderr, "[ERROR] Failed to rebuild index: %v\n", err)
 		return 1
 	}
@@ -756,7 +1023,46 @@ func rebuildCommand(filePath string) int {
 	return 0
 }
 
-func rebuildAllCommand(directory string) int {
+// parseRebuildAllArgs reads rebuild-all's optional directory (default "."),
+// --jobs N / --jobs=N worker count (default one per CPU) and --force flag
+func parseRebuildAllArgs(args []string) (string, int, bool, error) {
+	directory := ""
+	jobs := runtime.NumCPU()
+	force := false
+	for i := 0; i < len(args); i++ {
+		arg := args[i]
+		switch {
+		case arg == "--jobs" || strings.HasPrefix(arg, "--jobs="):
+			value, hasValue := strings.CutPrefix(arg, "--jobs=")
+			if !hasValue {
+				if i+1 >= len(args) {
+					return "", 0, false, fmt.Errorf("missing jobs argument")
+				}
+				i++
+				value = args[i]
+			}
+			n, err := strconv.Atoi(value)
+			if err != nil || n < 1 {
+				return "", 0, false, fmt.Errorf("invalid jobs value: %s", value)
+			}
+			jobs = n
+		case arg == "--force":
+			force = true
+		case strings.HasPrefix(arg, "--"):
+			return "", 0, false, fmt.Errorf("unknown option: %s", arg)
+		case directory != "":
+			return "", 0, false, fmt.Errorf("unexpected argument: %s", arg)
+		default:
+			directory = arg
+		}
+	}
+	if directory == "" {
+		directory = "."
+	}
+	return directory, jobs, force, nil
+}
+
+func rebuildAllCommand(directory string, jobs int, force bool) int {
 	if _, err := os.Stat(directory); os.IsNotExist(err) {
 		fmt.Fprintf(os.Stderr, "Error: Directory not found: %s\n", directory)
 		return 1
@@ -785,25 +1091,158 @@ func rebuildAllCommand(directory string) int {
 
 	fmt.Printf("Found %d .iatf file(s)\n", len(iatfFiles))
 
+	// Skip files whose size and mtime match their last successful rebuild by
+	// this version, unless --force is given
+	cache := loadRebuildCache()
+	cacheKeys := make([]string, len(iatfFiles))
+	stamps := make([]fileStamp, len(iatfFiles))
+	skipped := make([]bool, len(iatfFiles))
+	for i, file := range iatfFiles {
+		if absPath, err := filepath.Abs(file); err == nil {
+			cacheKeys[i] = absPath
+		} else {
+			cacheKeys[i] = file
+		}
+	}
+
+	// Files are independent, so rebuild them on a bounded worker pool and
+	// report results in walk order as each one completes.
+	workers := jobs
+	if workers > len(iatfFiles) {
+		workers = len(iatfFiles)
+	}
+	results := make([]error, len(iatfFiles))
+	done := make([]chan struct{}, len(iatfFiles))
+	for i := range done {
+		done[i] = make(chan struct{})
+	}
+	next := make(chan int)
+	for w := 0; w < workers; w++ {
+		go func() {
+			for i := range next {
+				file := iatfFiles[i]
+				if stamp, ok := statFileStamp(file); ok && !force && cache.Files[cacheKeys[i]].matches(stamp) {
+					stamps[i] = stamp
+					skipped[i] = true
+				} else if results[i] = rebuildIndex(file); results[i] == nil {
+					stamps[i], _ = statFileStamp(file)
+				}
+				close(done[i])
+			}
+		}()
+	}
+	go func() {
+		for i := range iatfFiles {
+			next <- i
+		}
+		close(next)
+	}()
+
 	successCount := 0
-	for _, file := range iatfFiles {
+	skippedCount := 0
+	for i, file := range iatfFiles {
+		<-done[i]
 		fmt.Printf("\nProcessing: %s\n", file)
-		if err := rebuildIndex(file); err != nil {
+		if err := results[i]; err != nil {
+			printRebuildDetails(err)
 			fmt.Printf("  [ERROR] Failed: %v\n", err)
+		} else if skipped[i] {
+			fmt.Println("  [OK] Unchanged (skipped)")
+			skippedCount++
 		} else {
 			fmt.Println("  [OK] Success")
 			successCount++
 		}
 	}
 
-	fmt.Printf("\nCompleted: %d/%d files rebuilt successfully\n", successCount, len(iatfFiles))
+	// Only rewrite the cache when an entry was added, changed or dropped
+	cacheChanged := false
+	for i, key := range cacheKeys {
+		previous, exists := cache.Files[key]
+		if results[i] == nil && !stamps[i].modTime.IsZero() {
+			if entry := newRebuildCacheEntry(stamps[i]); !exists || entry != previous {
+				cache.Files[key] = entry
+				cacheChanged = true
+			}
+		} else if exists {
+			delete(cache.Files, key)
+			cacheChanged = true
+		}
+	}
+	if cacheChanged {
+		saveRebuildCache(cache)
+	}
+
+	if skippedCount == len(iatfFiles) {
+		fmt.Printf("\nCompleted: %d files unchanged (skipped)\n", skippedCount)
+	} else if skippedCount > 0 {
+		fmt.Printf("\nCompleted: %d/%d files rebuilt successfully, %d unchanged (skipped)\n",
+			successCount, len(iatfFiles)-skippedCount, skippedCount)
+	} else {
+		fmt.Printf("\nCompleted: %d/%d files rebuilt successfully\n", successCount, len(iatfFiles))
+	}
 
-	if successCount == len(iatfFiles) {
+	if successCount+skippedCount == len(iatfFiles) {
 		return 0
 	}
 	return 1
 }
 
+// rebuildCache maps absolute file paths to their state after rebuild-all
+// last rebuilt them. It is discarded when written by a different Version,
+// since INDEX output may differ between releases.
+type rebuildCache struct {
+	Version string                       `json:"version"`
+	Files   map[string]rebuildCacheEntry `json:"files"`
+}
+
+// rebuildCacheEntry records a file's size and mtime after rebuild-all last
+// rebuilt it successfully
+type rebuildCacheEntry struct {
+	Size    int64 `json:"size"`
+	ModTime int64 `json:"mtime_ns"`
+}
+
+func newRebuildCacheEntry(stamp fileStamp) rebuildCacheEntry {
+	return rebuildCacheEntry{Size: stamp.size, ModTime: stamp.modTime.UnixNano()}
+}
+
+func (e rebuildCacheEntry) matches(stamp fileStamp) bool {
+	return e.ModTime != 0 && e.Size == stamp.size && e.ModTime == stamp.modTime.UnixNano()
+}
+
+func getRebuildCacheFile() string {
+	home, _ := os.UserHomeDir()
+	return filepath.Join(home, ".iatf", "rebuild_cache.json")
+}
+
+// loadRebuildCache returns the rebuild-all cache, or an empty cache if it is
+// missing, unreadable or from another version
+func loadRebuildCache() rebuildCache {
+	empty := rebuildCache{Version: Version, Files: make(map[string]rebuildCacheEntry)}
+	data, err := os.ReadFile(getRebuildCacheFile())
+	if err != nil {
+		return empty
+	}
+	var cache rebuildCache
+	if err := json.Unmarshal(data, &cache); err != nil || cache.Version != Version || cache.Files == nil {
+		return empty
+	}
+	return cache
+}
+
+func saveRebuildCache(cache rebuildCache) error {
+	cacheFile := getRebuildCacheFile()
+	os.MkdirAll(filepath.Dir(cacheFile), 0755)
+
+	data, err := json.MarshalIndent(cache, "", "  ")
+	if err != nil {
+		return err
+	}
+
+	return os.WriteFile(cacheFile, data, 0644)
+}
+
 func getWatchStateFile() string {
 	home, _ := os.UserHomeDir()
 	return filepath.Join(home, ".iatf", "watch.json")
@@ -906,9 +1345,13 @@ func watchCommand(filePath string, debug bool) int {
 		return 1
 	}
 
-	if _, err := os.Stat(absPath); os.IsNotExist(err) {
+	info, err := os.Stat(absPath)
+	if os.IsNotExist(err) {
 		fmt.Fprintf(os.Stderr, "Error: File not found: %s\n", filePath)
 		return 1
+	} else if err != nil {
+		fmt.Fprintf(os.Stderr, "Error: %v\n", err)
+		return 1
 	}
 
 	state, err := loadWatchState()
@@ -918,10 +1361,9 @@ func watchCommand(filePath string, debug bool) int {
 	}
 
 	pid := os.Getpid()
-	info, _ := os.Stat(absPath)
 	state[absPath] = WatchInfo{
 		Started:      time.Now().Format(time.RFC3339),
-		LastModified: float64(info.ModTime().Unix()),
+		LastModified: float64(info.ModTime().UnixNano()) / 1e9,
 		PID:          pid,
 	}
 
@@ -951,8 +1393,28 @@ func watchCommand(filePath string, debug bool) int {
 
 	fmt.Printf("Watching: %s\n", filePath)
 
-	lastMod := info.ModTime()
-	ticker := time.NewTicker(250 * time.Millisecond)
+	// Compare full-precision mtime and size so edits landing within the same
+	// timestamp tick are still noticed
+	lastSeen := fileStamp{modTime: info.ModTime(), size: info.Size()}
+
+	// Stamp of the watch state file when this watcher's entry was last seen
+	// in it; the file is only re-read once the stamp changes
+	stateFile := getWatchStateFile()
+	var stateSeen fileStamp
+
+	// Prefer kernel change notifications (also covering the watch state file so
+	// unwatch is seen immediately); keep a slow poll as a safety net. Without
+	// notifications, poll with idle backoff.
+	var backoff *pollBackoff
+	var ticker *time.Ticker
+	changes, stopNotifier, err := newFileNotifier([]string{absPath, stateFile})
+	if err == nil {
+		defer stopNotifier()
+		ticker = time.NewTicker(5 * time.Second)
+	} else {
+		backoff = newPollBackoff()
+		ticker = backoff.ticker
+	}
 	defer ticker.Stop()
 
 	var debounceTimer *time.Timer
@@ -971,7 +1433,11 @@ func watchCommand(filePath string, debug bool) int {
 				fmt.Println("\nWatch stopped")
 			}
 			return 0
+		case <-changes:
 		case <-ticker.C:
+		}
+
+		if stamp, ok := statFileStamp(stateFile); !ok || !stamp.equal(stateSeen) {
 			state, err := loadWatchState()
 			if err == nil {
 				if _, exists := state[absPath]; !exists {
@@ -980,38 +1446,111 @@ func watchCommand(filePath string, debug bool) int {
 					}
 					return 0
 				}
+				stateSeen = stamp
 			}
+		}
 
-			currentInfo, err := os.Stat(absPath)
-			if err != nil {
-				cleanupPID()
-				if debug {
-					fmt.Printf("\nWarning: File no longer exists: %s\n", filePath)
-				}
-				return 0
+		currentInfo, err := os.Stat(absPath)
+		if err != nil {
+			cleanupPID()
+			if debug {
+				fmt.Printf("\nWarning: File no longer exists: %s\n", filePath)
 			}
+			return 0
+		}
 
-			if currentInfo.ModTime().After(lastMod) {
-				lastMod = currentInfo.ModTime()
-				if debug {
-					fmt.Printf("[%s] Change detected, waiting 3s...\n", filepath.Base(absPath))
-				}
+		current := fileStamp{modTime: currentInfo.ModTime(), size: currentInfo.Size()}
+		changed := !current.equal(lastSeen)
+		if changed && isWatchBuild(absPath, current) {
+			// Our own rebuild wrote the file; note it without re-triggering
+			lastSeen = current
+			changed = false
+		}
+		if backoff != nil {
+			backoff.update(changed)
+		}
+		if changed {
+			lastSeen = current
+			if debug {
+				fmt.Printf("[%s] Change detected, waiting 3s...\n", filepath.Base(absPath))
+			}
 
-				timerMu.Lock()
-				if debounceTimer != nil {
-					debounceTimer.Stop()
-				}
-				debounceTimer = time.AfterFunc(3*time.Second, func() {
-					processFileForWatch(absPath, debug)
-				})
-				timerMu.Unlock()
+			timerMu.Lock()
+			if debounceTimer != nil {
+				debounceTimer.Stop()
 			}
+			debounceTimer = time.AfterFunc(3*time.Second, func() {
+				processFileForWatch(absPath, debug)
+			})
+			timerMu.Unlock()
 		}
 	}
 }
 
+// fileStamp identifies a file version by modification time and size
+type fileStamp struct {
+	modTime time.Time
+	size    int64
+}
+
+func (s fileStamp) equal(other fileStamp) bool {
+	return s.size == other.size && s.modTime.Equal(other.modTime)
+}
+
+// watchBuildStamps records each file's stamp right after a watcher rebuilt it,
+// so a later trigger on an untouched file (usually the rebuild's own write)
+// skips validation and parsing.
+var (
+	watchBuildMu     sync.Mutex
+	watchBuildStamps = make(map[string]fileStamp)
+)
+
+// watchRebuildMu is held while a watcher rebuilds a file, so a change check
+// racing with the rebuild's own write waits until its stamp is recorded.
+var watchRebuildMu sync.RWMutex
+
+func statFileStamp(filePath string) (fileStamp, bool) {
+	info, err := os.Stat(filePath)
+	if err != nil {
+		return fileStamp{}, false
+	}
+	return fileStamp{modTime: info.ModTime(), size: info.Size()}, true
+}
+
+// watchBuildCurrent reports whether the file is unchanged since the watcher last rebuilt it.
+func watchBuildCurrent(filePath string) bool {
+	stamp, ok := statFileStamp(filePath)
+	return ok && isWatchBuild(filePath, stamp)
+}
+
+// isWatchBuild reports whether stamp is the one recorded right after the
+// watcher's own rebuild of filePath, i.e. the change is the rebuild's write.
+func isWatchBuild(filePath string, stamp fileStamp) bool {
+	watchRebuildMu.RLock()
+	defer watchRebuildMu.RUnlock()
+	watchBuildMu.Lock()
+	defer watchBuildMu.Unlock()
+	last, exists := watchBuildStamps[filePath]
+	return exists && last.equal(stamp)
+}
+
+func recordWatchBuild(filePath string) {
+	stamp, ok := statFileStamp(filePath)
+	if !ok {
+		return
+	}
+	watchBuildMu.Lock()
+	watchBuildStamps[filePath] = stamp
+	watchBuildMu.Unlock()
+}
+
 // processFileForWatch validates and rebuilds a single file
 func processFileForWatch(filePath string, debug bool) {
+	if watchBuildCurrent(filePath) {
+		return
+	}
+	watchRebuildMu.Lock()
+	defer watchRebuildMu.Unlock()
 	valid, errors := validateFileQuiet(filePath)
 	if !valid {
 		if debug {
@@ -1025,9 +1564,11 @@ func processFileForWatch(filePath string, debug bool) {
 	if err := rebuildIndex(filePath); err != nil {
 		if debug {
 			fmt.Printf("[%s] Rebuild failed: %v\n", filepath.Base(filePath), err)
+			printRebuildDetails(err)
 		}
 		return
 	}
+	recordWatchBuild(filePath)
 	if debug {
 		fmt.Printf("[%s] Index rebuilt\n", filepath.Base(filePath))
 	}
@@ -1077,6 +1618,48 @@ func listWatched() int {
 	return 0
 }
 
+// Polling intervals for watchers without change notifications. Polling starts
+// at watchPollMin and slows to watchPollMax once nothing has changed for
+// watchPollIdle, returning to watchPollMin on the next change.
+const (
+	watchPollMin  = 250 * time.Millisecond
+	watchPollMax  = 2 * time.Second
+	watchPollIdle = 30 * time.Second
+)
+
+// pollBackoff adjusts a polling ticker based on recent activity
+type pollBackoff struct {
+	ticker     *time.Ticker
+	interval   time.Duration
+	lastChange time.Time
+}
+
+func newPollBackoff() *pollBackoff {
+	return &pollBackoff{
+		ticker:     time.NewTicker(watchPollMin),
+		interval:   watchPollMin,
+		lastChange: time.Now(),
+	}
+}
+
+// update records whether the last poll saw a change and retunes the ticker
+func (b *pollBackoff) update(changed bool) {
+	next := b.interval
+	if changed {
+		b.lastChange = time.Now()
+		next = watchPollMin
+	} else if time.Since(b.lastChange) >= watchPollIdle && b.interval < watchPollMax {
+		next = b.interval * 2
+		if next > watchPollMax {
+			next = watchPollMax
+		}
+	}
+	if next != b.interval {
+		b.interval = next
+		b.ticker.Reset(next)
+	}
+}
+
 // fileState tracks per-file debounce state for directory watching
 type fileState struct {
 	lastModTime time.Time
@@ -1128,8 +1711,8 @@ func watchDirCommand(dirPath string, debug bool) int {
 	sigChan := make(chan os.Signal, 1)
 	signal.Notify(sigChan, syscall.SIGINT, syscall.SIGTERM)
 
-	ticker := time.NewTicker(250 * time.Millisecond)
-	defer ticker.Stop()
+	backoff := newPollBackoff()
+	defer backoff.ticker.Stop()
 
 	for {
 		select {
@@ -1145,7 +1728,8 @@ func watchDirCommand(dirPath string, debug bool) int {
 				fmt.Println("\nWatch stopped")
 			}
 			return 0
-		case <-ticker.C:
+		case <-backoff.ticker.C:
+			changed := false
 			filepath.WalkDir(absDir, func(path string, d fs.DirEntry, err error) error {
 				if err != nil || d.IsDir() || !strings.HasSuffix(path, ".iatf") {
 					return nil
@@ -1161,6 +1745,7 @@ func watchDirCommand(dirPath string, debug bool) int {
 
 				if !exists {
 					// New file detected
+					changed = true
 					files[path] = &fileState{lastModTime: stat.ModTime()}
 					filesMu.Unlock()
 					if debug {
@@ -1171,6 +1756,12 @@ func watchDirCommand(dirPath string, debug bool) int {
 
 				if stat.ModTime().After(state.lastModTime) {
 					state.lastModTime = stat.ModTime()
+					if isWatchBuild(path, fileStamp{modTime: stat.ModTime(), size: stat.Size()}) {
+						// Our own rebuild wrote the file; note it without re-triggering
+						filesMu.Unlock()
+						return nil
+					}
+					changed = true
 					if debug {
 						fmt.Printf("[%s] Change detected, waiting 3s...\n", filepath.Base(path))
 					}
@@ -1195,12 +1786,14 @@ func watchDirCommand(dirPath string, debug bool) int {
 						state.timer.Stop()
 					}
 					delete(files, path)
+					changed = true
 					if debug {
 						fmt.Printf("Stopped watching (deleted): %s\n", path)
 					}
 				}
 			}
 			filesMu.Unlock()
+			backoff.update(changed)
 		}
 	}
 }
@@ -1416,8 +2009,8 @@ func watchMultipleDirs(paths []string, debug bool) {
 	sigChan := make(chan os.Signal, 1)
 	signal.Notify(sigChan, syscall.SIGINT, syscall.SIGTERM)
 
-	ticker := time.NewTicker(250 * time.Millisecond)
-	defer ticker.Stop()
+	backoff := newPollBackoff()
+	defer backoff.ticker.Stop()
 
 	for {
 		select {
@@ -1431,7 +2024,8 @@ func watchMultipleDirs(paths []string, debug bool) {
 			filesMu.Unlock()
 			fmt.Printf("[%s] Daemon stopped\n", time.Now().Format(time.RFC3339))
 			return
-		case <-ticker.C:
+		case <-backoff.ticker.C:
+			changed := false
 			for _, dirPath := range paths {
 				filepath.WalkDir(dirPath, func(path string, d fs.DirEntry, err error) error {
 					if err != nil || d.IsDir() || !strings.HasSuffix(path, ".iatf") {
@@ -1447,6 +2041,7 @@ func watchMultipleDirs(paths []string, debug bool) {
 					state, exists := files[path]
 
 					if !exists {
+						changed = true
 						files[path] = &fileState{lastModTime: stat.ModTime()}
 						filesMu.Unlock()
 						if debug {
@@ -1457,6 +2052,12 @@ func watchMultipleDirs(paths []string, debug bool) {
 
 					if stat.ModTime().After(state.lastModTime) {
 						state.lastModTime = stat.ModTime()
+						if isWatchBuild(path, fileStamp{modTime: stat.ModTime(), size: stat.Size()}) {
+							// Our own rebuild wrote the file; note it without re-triggering
+							filesMu.Unlock()
+							return nil
+						}
+						changed = true
 						if debug {
 							fmt.Printf("[%s] Change: %s\n", time.Now().Format(time.RFC3339), path)
 						}
@@ -1466,6 +2067,11 @@ func watchMultipleDirs(paths []string, debug bool) {
 						}
 						pathCopy := path
 						state.timer = time.AfterFunc(3*time.Second, func() {
+							if watchBuildCurrent(pathCopy) {
+								return
+							}
+							watchRebuildMu.Lock()
+							defer watchRebuildMu.Unlock()
 							valid, errors := validateFileQuiet(pathCopy)
 							if !valid {
 								fmt.Printf("[%s] Validation failed: %s\n", time.Now().Format(time.RFC3339), pathCopy)
@@ -1476,8 +2082,10 @@ func watchMultipleDirs(paths []string, debug bool) {
 							}
 							if err := rebuildIndex(pathCopy); err != nil {
 								fmt.Printf("[%s] Rebuild failed: %s - %v\n", time.Now().Format(time.RFC3339), pathCopy, err)
+								printRebuildDetails(err)
 								return
 							}
+							recordWatchBuild(pathCopy)
 							fmt.Printf("[%s] Rebuilt: %s\n", time.Now().Format(time.RFC3339), pathCopy)
 						})
 					}
@@ -1494,12 +2102,14 @@ func watchMultipleDirs(paths []string, debug bool) {
 						state.timer.Stop()
 					}
 					delete(files, path)
+					changed = true
 					if debug {
 						fmt.Printf("[%s] Deleted: %s\n", time.Now().Format(time.RFC3339), path)
 					}
 				}
 			}
 			filesMu.Unlock()
+			backoff.update(changed)
 		}
 	}
 }
@@ -1540,9 +2150,7 @@ func indexCommand(filePath string) int {
 		return 1
 	}
 
-	for _, line := range lines[indexStart+1 : indexEnd] {
-		fmt.Println(line)
-	}
+	printLines(lines[indexStart+1 : indexEnd])
 
 	return 0
 }
@@ -1598,14 +2206,22 @@ func readCommand(filePath string, sectionID string) int {
 		return 1
 	}
 
-	sectionLines := lines[targetSection.Start-1 : targetSection.End]
-	for _, line := range sectionLines {
-		fmt.Println(line)
-	}
+	printLines(lines[targetSection.Start-1 : targetSection.End])
 
 	return 0
 }
 
+// printLines writes each line to stdout through one buffer instead of one
+// write per line
+func printLines(lines []string) {
+	out := bufio.NewWriter(os.Stdout)
+	for _, line := range lines {
+		out.WriteString(line)
+		out.WriteByte('\n')
+	}
+	out.Flush()
+}
+
 func readByTitleCommand(filePath string, title string) int {
 	if _, err := os.Stat(filePath); os.IsNotExist(err) {
 		fmt.Fprintf(os.Stderr, "Error: File not found: %s\n", filePath)
@@ -1636,8 +2252,6 @@ func readByTitleCommand(filePath string, title string) int {
 		return 1
 	}
 
-	indexEntryPattern := regexp.MustCompile(`^#{1,6}\s+(.+)\s*\{#([a-zA-Z][a-zA-Z0-9_-]*)\s*\|.*\}$`)
-
 	type indexEntry struct {
 		title string
 		id    string
@@ -1645,7 +2259,11 @@ func readByTitleCommand(filePath string, title string) int {
 
 	entries := []indexEntry{}
 	for _, line := range lines[indexStart+1 : indexEnd] {
-		match := indexEntryPattern.FindStringSubmatch(strings.TrimSpace(line))
+		stripped := strings.TrimSpace(line)
+		if stripped == "" || stripped[0] != '#' {
+			continue
+		}
+		match := indexEntryTitlePattern.FindStringSubmatch(stripped)
 		if match != nil {
 			entries = append(entries, indexEntry{title: match[1], id: match[2]})
 		}
@@ -1709,91 +2327,72 @@ func graphCommand(filePath string, showIncoming bool) int {
 		return 1
 	}
 
-	if err := validateNesting(lines, contentStart); err != nil {
+	// Parse sections to get ordered list
+	sections, err := parseContentSectionChecked(lines, contentStart)
+	if err != nil {
 		fmt.Fprintf(os.Stderr, "Error: Invalid section nesting: %v\n", err)
 		return 1
 	}
 
-	// Parse sections to get ordered list
-	sections := parseContentSection(lines, contentStart)
-
 	if len(sections) == 0 {
 		fmt.Fprintln(os.Stderr, "Error: No sections found in CONTENT")
 		return 1
 	}
 
-	// Extract references (returns map of target -> locations where it's referenced)
-	// This is the "incoming" map: targetID -> who references it
-	incomingRefsMap := extractReferences(lines, contentStart)
+	// Extract references (every {@target} with the section containing it)
+	references := extractReferences(lines, contentStart)
 
-	// Build outgoing reference map (section -> what it references)
-	outgoingRefs := make(map[string][]string)
-	for targetID, locations := range incomingRefsMap {
-		for _, loc := range locations {
-			if loc.ContainingSection != "" {
-				// Add targetID to the list of refs from ContainingSection
-				if !contains(outgoingRefs[loc.ContainingSection], targetID) {
-					outgoingRefs[loc.ContainingSection] = append(outgoingRefs[loc.ContainingSection], targetID)
-				}
-			}
+	// Map each section to the sections it references, or with --show-incoming
+	// to the sections that reference it; only the printed direction is built
+	refMap := make(map[string][]string)
+	for _, ref := range references {
+		if ref.ContainingSection == "" {
+			continue
 		}
-	}
-
-	// Convert incoming refs to simpler format
-	incomingRefs := make(map[string][]string)
-	for targetID, locations := range incomingRefsMap {
-		for _, loc := range locations {
-			if loc.ContainingSection != "" {
-				if !contains(incomingRefs[targetID], loc.ContainingSection) {
-					incomingRefs[targetID] = append(incomingRefs[targetID], loc.ContainingSection)
-				}
-			}
+		if showIncoming {
+			refMap[ref.Target] = append(refMap[ref.Target], ref.ContainingSection)
+		} else {
+			refMap[ref.ContainingSection] = append(refMap[ref.ContainingSection], ref.Target)
 		}
 	}
 
-	// Sort references for deterministic output
-	for sectionID := range outgoingRefs {
-		sort.Strings(outgoingRefs[sectionID])
+	// Sort and drop repeated references for deterministic output
+	for sectionID, refs := range refMap {
+		refMap[sectionID] = sortUnique(refs)
 	}
-	for sectionID := range incomingRefs {
-		sort.Strings(incomingRefs[sectionID])
+
+	arrow := "->"
+	if showIncoming {
+		arrow = "<-"
 	}
 
-	// Output in compact format
-	fmt.Printf("@graph: %s\n\n", baseFilename)
+	// Output in compact format, buffered so each line is not its own write
+	out := bufio.NewWriter(os.Stdout)
+	defer out.Flush()
+	fmt.Fprintf(out, "@graph: %s\n\n", baseFilename)
 
-	if showIncoming {
-		// Show incoming references (who references this section)
-		for _, section := range sections {
-			refs := incomingRefs[section.ID]
-			if len(refs) > 0 {
-				fmt.Printf("%s <- %s\n", section.ID, strings.Join(refs, ", "))
-			} else {
-				fmt.Println(section.ID)
-			}
-		}
-	} else {
-		// Show outgoing references (what this section references)
-		for _, section := range sections {
-			refs := outgoingRefs[section.ID]
-			if len(refs) > 0 {
-				fmt.Printf("%s -> %s\n", section.ID, strings.Join(refs, ", "))
-			} else {
-				fmt.Println(section.ID)
-			}
+	for _, section := range sections {
+		refs := refMap[section.ID]
+		if len(refs) > 0 {
+			fmt.Fprintf(out, "%s %s %s\n", section.ID, arrow, strings.Join(refs, ", "))
+		} else {
+			fmt.Fprintln(out, section.ID)
 		}
 	}
 
 	return 0
 }
 
-func contains(slice []string, value string) bool {
-	for _, item := range slice {
-		if item == value {
-			return true
+// sortUnique sorts values in place and returns them with duplicates removed
+func sortUnique(values []string) []string {
+	sort.Strings(values)
+	unique := values[:0]
+	for _, value := range values {
+		if len(unique) == 0 || value != unique[len(unique)-1] {
+			unique = append(unique, value)
 		}
 	}
-	return false
+	return unique
 }
 
 // validateFileQuiet performs validation without printing, returns errors
@@ -1812,15 +2411,7 @@ func validateFileQuiet(filePath string) (bool, []string) {
 	}
 
 	// Check INDEX and CONTENT sections exist
-	indexPositions := []int{}
-	contentPositions := []int{}
-	for i, line := range lines {
-		if strings.TrimSpace(line) == "===INDEX===" {
-			indexPositions = append(indexPositions, i)
-		} else if strings.TrimSpace(line) == "===CONTENT===" {
-			contentPositions = append(contentPositions, i)
-		}
-	}
+	indexPositions, contentPositions := findMarkerPositions(lines)
 
 	hasContent := len(contentPositions) > 0
 	if !hasContent {
@@ -1837,28 +2428,34 @@ func validateFileQuiet(filePath string) (bool, []string) {
 		errors = append(errors, "INDEX section appears after CONTENT")
 	}
 
-	// Validate nesting
+	// Validate nesting while parsing CONTENT; the sections feed the
+	// reference check below
 	contentStart := -1
-	for i, line := range lines {
-		if strings.TrimSpace(line) == "===CONTENT===" {
-			contentStart = i + 1
-			break
-		}
+	if hasContent {
+		contentStart = contentPositions[0] + 1
 	}
 
+	var parsedSections []Section
 	if contentStart != -1 {
-		if err := validateNesting(lines, contentStart); err != nil {
+		var err error
+		parsedSections, err = parseContentSectionChecked(lines, contentStart)
+		if err != nil {
 			errors = append(errors, fmt.Sprintf("Invalid section nesting: %v", err))
 		}
 	}
 
-	// Check for unclosed/mismatched sections
+	// Check for unclosed/mismatched sections and duplicate section IDs
 	openSections := []string{}
+	sectionIDs := make(map[string]bool)
+	duplicateErrors := []string{}
 	for _, line := range lines {
-		if match := sectionOpenPattern.FindStringSubmatch(line); match != nil {
-			openSections = append(openSections, match[1])
-		} else if match := sectionClosePattern.FindStringSubmatch(line); match != nil {
-			id := match[1]
+		if id, ok := parseSectionTag(line, '#'); ok {
+			openSections = append(openSections, id)
+			if sectionIDs[id] {
+				duplicateErrors = append(duplicateErrors, fmt.Sprintf("Duplicate section ID: %s", id))
+			}
+			sectionIDs[id] = true
+		} else if id, ok := parseSectionTag(line, '/'); ok {
 			if len(openSections) > 0 && openSections[len(openSections)-1] == id {
 				openSections = openSections[:len(openSections)-1]
 			} else {
@@ -1869,22 +2466,10 @@ func validateFileQuiet(filePath string) (bool, []string) {
 	for _, id := range openSections {
 		errors = append(errors, fmt.Sprintf("Unclosed section: %s", id))
 	}
-
-	// Check for duplicate section IDs
-	sectionIDs := make(map[string]bool)
-	for _, line := range lines {
-		if match := sectionOpenPattern.FindStringSubmatch(line); match != nil {
-			id := match[1]
-			if sectionIDs[id] {
-				errors = append(errors, fmt.Sprintf("Duplicate section ID: %s", id))
-			}
-			sectionIDs[id] = true
-		}
-	}
+	errors = append(errors, duplicateErrors...)
 
 	// Validate references
 	if contentStart != -1 && len(openSections) == 0 {
-		parsedSections := parseContentSection(lines, contentStart)
 		refErrors := validateReferences(lines, contentStart, parsedSections)
 		errors = append(errors, refErrors...)
 	}
@@ -1892,6 +2477,21 @@ func validateFileQuiet(filePath string) (bool, []string) {
 	return len(errors) == 0, errors
 }
 
+// validateFilesCommand validates each file in turn within a single process.
+// Returns 1 if any file is invalid.
+func validateFilesCommand(filePaths []string) int {
+	exitCode := 0
+	for i, filePath := range filePaths {
+		if i > 0 {
+			fmt.Println()
+		}
+		if validateCommand(filePath) != 0 {
+			exitCode = 1
+		}
+	}
+	return exitCode
+}
+
 func validateCommand(filePath string) int {
 	if _, err := os.Stat(filePath); os.IsNotExist(err) {
 		fmt.Fprintf(os.Stderr, "Error: File not found: %s\n", filePath)
@@ -1915,15 +2515,7 @@ func validateCommand(filePath string) int {
 	} else {
 		fmt.Println("[OK] Format declaration found")
 	}
-	indexPositions := []int{}
-	contentPositions := []int{}
-	for i, line := range lines {
-		if strings.TrimSpace(line) == "===INDEX===" {
-			indexPositions = append(indexPositions, i)
-		} else if strings.TrimSpace(line) == "===CONTENT===" {
-			contentPositions = append(contentPositions, i)
-		}
-	}
+	indexPositions, contentPositions := findMarkerPositions(lines)
 	hasIndex := len(indexPositions) > 0
 	hasContent := len(contentPositions) > 0
 
@@ -1949,19 +2541,25 @@ func validateCommand(filePath string) int {
 		errors = append(errors, "INDEX section appears after CONTENT")
 	}
 
+	// The INDEX used below is the last one before the first CONTENT marker
 	indexStart := -1
 	contentStart := -1
-	for i, line := range lines {
-		if strings.TrimSpace(line) == "===INDEX===" {
-			indexStart = i
-		} else if strings.TrimSpace(line) == "===CONTENT===" {
-			contentStart = i + 1
-			break
+	if hasContent {
+		contentStart = contentPositions[0] + 1
+	}
+	for _, pos := range indexPositions {
+		if contentStart == -1 || pos < contentStart {
+			indexStart = pos
 		}
 	}
 
+	// Validate nesting while parsing CONTENT; the sections are shared by the
+	// INDEX comparison and reference checks below
+	var parsedSections []Section
 	if contentStart != -1 {
-		if err := validateNesting(lines, contentStart); err != nil {
+		var err error
+		parsedSections, err = parseContentSectionChecked(lines, contentStart)
+		if err != nil {
 			errors = append(errors, fmt.Sprintf("Invalid section nesting: %v", err))
 		}
 	}
@@ -1977,8 +2575,7 @@ func validateCommand(filePath string) int {
 			}
 		}
 		if contentHashLine != "" && contentStart != -1 {
-			hashRe := regexp.MustCompile(`^<!-- Content-Hash:\s*([a-z0-9]+):([a-f0-9]+)\s*-->$`)
-			matches := hashRe.FindStringSubmatch(strings.TrimSpace(contentHashLine))
+			matches := contentHashPattern.FindStringSubmatch(strings.TrimSpace(contentHashLine))
 			if matches == nil {
 				warnings = append(warnings, "Invalid Content-Hash format in INDEX")
 			} else {
@@ -1987,8 +2584,7 @@ func validateCommand(filePath string) int {
 				if algo != "sha256" {
 					warnings = append(warnings, fmt.Sprintf("Unsupported Content-Hash algorithm: %s", algo))
 				} else {
-					contentText := strings.Join(lines[contentStart:], "\n")
-					sum := sha256.Sum256([]byte(contentText))
+					sum := sha256.Sum256(content[lineOffset(lines, contentStart):])
 					actualHash := hex.EncodeToString(sum[:])
 					hashMatches := false
 					if len(expectedHash) == 7 {
@@ -2006,19 +2602,38 @@ func validateCommand(filePath string) int {
 		}
 	}
 
+	// Track open tags, seen IDs and the first line of content outside a
+	// section in one pass. Duplicate errors are reported after the INDEX
+	// checks below, and stray content only when nesting is valid.
 	openSections := []string{}
 	invalidNesting := false
-	for _, line := range lines {
-		if match := sectionOpenPattern.FindStringSubmatch(line); match != nil {
-			openSections = append(openSections, match[1])
-		} else if match := sectionClosePattern.FindStringSubmatch(line); match != nil {
-			id := match[1]
+	sectionIDs := make(map[string]bool)
+	duplicateErrors := []string{}
+	contentOpen := []string{} // sections opened within CONTENT
+	outsideLine := 0
+	for i, line := range lines {
+		inContent := contentStart != -1 && i >= contentStart
+		if id, ok := parseSectionTag(line, '#'); ok {
+			openSections = append(openSections, id)
+			if sectionIDs[id] {
+				duplicateErrors = append(duplicateErrors, fmt.Sprintf("Duplicate section ID: %s", id))
+			}
+			sectionIDs[id] = true
+			if inContent {
+				contentOpen = append(contentOpen, id)
+			}
+		} else if id, ok := parseSectionTag(line, '/'); ok {
 			if len(openSections) > 0 && openSections[len(openSections)-1] == id {
 				openSections = openSections[:len(openSections)-1]
 			} else {
 				errors = append(errors, fmt.Sprintf("Closing tag without matching opening: %s", id))
 				invalidNesting = true
 			}
+			if inContent && len(contentOpen) > 0 && contentOpen[len(contentOpen)-1] == id {
+				contentOpen = contentOpen[:len(contentOpen)-1]
+			}
+		} else if inContent && outsideLine == 0 && len(contentOpen) == 0 && strings.TrimSpace(line) != "" {
+			outsideLine = i + 1
 		}
 	}
 	if len(openSections) > 0 {
@@ -2031,32 +2646,19 @@ func validateCommand(filePath string) int {
 		fmt.Println("[OK] All sections properly closed")
 	}
 
-	if !invalidNesting && contentStart != -1 {
-		contentOpen := []string{}
-		for i := contentStart; i < len(lines); i++ {
-			line := lines[i]
-			if match := sectionOpenPattern.FindStringSubmatch(line); match != nil {
-				contentOpen = append(contentOpen, match[1])
-				continue
-			}
-			if match := sectionClosePattern.FindStringSubmatch(line); match != nil {
-				if len(contentOpen) > 0 && contentOpen[len(contentOpen)-1] == match[1] {
-					contentOpen = contentOpen[:len(contentOpen)-1]
-				}
-				continue
-			}
-			if len(contentOpen) == 0 && strings.TrimSpace(line) != "" {
-				errors = append(errors, fmt.Sprintf("Content outside section block at line %d", i+1))
-				break
-			}
-		}
+	if !invalidNesting && outsideLine != 0 {
+		errors = append(errors, fmt.Sprintf("Content outside section block at line %d", outsideLine))
 	}
 
 	if !invalidNesting && hasIndex && contentStart != -1 && indexStart != -1 {
-		indexEntryRe := regexp.MustCompile(`^#{1,6}\s+.*\{#([a-zA-Z][a-zA-Z0-9_-]*)\s*\|\s*lines:(\d+)-(\d+)[^}]*\}$`)
 		indexRanges := map[string][2]int{}
 		for _, line := range lines[indexStart+1 : contentStart] {
-			match := indexEntryRe.FindStringSubmatch(strings.TrimSpace(line))
+			// Only heading lines can be entries; skip the regex for the rest
+			stripped := strings.TrimSpace(line)
+			if stripped == "" || stripped[0] != '#' {
+				continue
+			}
+			match := indexEntryRangePattern.FindStringSubmatch(stripped)
 			if match == nil {
 				continue
 			}
@@ -2078,7 +2680,6 @@ func validateCommand(filePath string) int {
 		}
 
 		contentSections := map[string][2]int{}
-		parsedSections := parseContentSection(lines, contentStart)
 		for _, section := range parsedSections {
 			contentSections[section.ID] = [2]int{section.Start, section.End}
 			if section.Level > 2 {
@@ -2105,16 +2706,7 @@ func validateCommand(filePath string) int {
 		}
 	}
 
-	sectionIDs := make(map[string]bool)
-	for _, line := range lines {
-		if match := sectionOpenPattern.FindStringSubmatch(line); match != nil {
-			id := match[1]
-			if sectionIDs[id] {
-				errors = append(errors, fmt.Sprintf("Duplicate section ID: %s", id))
-			}
-			sectionIDs[id] = true
-		}
-	}
+	errors = append(errors, duplicateErrors...)
 
 	if len(sectionIDs) > 0 {
 		fmt.Printf("[OK] Found %d section(s) with unique IDs\n", len(sectionIDs))
@@ -2123,8 +2715,7 @@ func validateCommand(filePath string) int {
 	}
 
 	if !invalidNesting && contentStart != -1 {
-		parsedSectionsForRefs := parseContentSection(lines, contentStart)
-		refErrors := validateReferences(lines, contentStart, parsedSectionsForRefs)
+		refErrors := validateReferences(lines, contentStart, parsedSections)
 		if len(refErrors) == 0 {
 			fmt.Println("[OK] All references valid")
 		} else {
@@ -0,0 +1,75 @@
+//go:build linux
+
+package main
+
+import (
+	"encoding/binary"
+	"os"
+	"path/filepath"
+	"strings"
+	"syscall"
+)
+
+// newFileNotifier returns a channel that receives a value whenever one of the
+// given files is written, created, renamed or removed. Parent directories are
+// watched (not the files themselves) so editors that save via rename are seen.
+// Call the returned stop function to release the inotify instance.
+func newFileNotifier(paths []string) (<-chan struct{}, func(), error) {
+	fd, err := syscall.InotifyInit1(syscall.IN_CLOEXEC | syscall.IN_NONBLOCK)
+	if err != nil {
+		return nil, nil, err
+	}
+
+	const mask = syscall.IN_MODIFY | syscall.IN_CLOSE_WRITE | syscall.IN_ATTRIB |
+		syscall.IN_CREATE | syscall.IN_DELETE | syscall.IN_MOVED_FROM | syscall.IN_MOVED_TO
+
+	dirWatches := make(map[string]int32)
+	names := make(map[int32]map[string]bool)
+	for _, path := range paths {
+		dir := filepath.Dir(path)
+		wd, exists := dirWatches[dir]
+		if !exists {
+			w, err := syscall.InotifyAddWatch(fd, dir, mask)
+			if err != nil {
+				syscall.Close(fd)
+				return nil, nil, err
+			}
+			wd = int32(w)
+			dirWatches[dir] = wd
+			names[wd] = make(map[string]bool)
+		}
+		names[wd][filepath.Base(path)] = true
+	}
+
+	// A non-blocking fd wrapped in os.File uses the runtime poller, so Close
+	// unblocks the reader goroutine below.
+	file := os.NewFile(uintptr(fd), "inotify")
+	events := make(chan struct{}, 1)
+
+	go func() {
+		buf := make([]byte, 64*1024)
+		for {
+			n, err := file.Read(buf)
+			if err != nil {
+				return
+			}
+			for offset := 0; offset+syscall.SizeofInotifyEvent <= n; {
+				wd := int32(binary.NativeEndian.Uint32(buf[offset:]))
+				nameLen := int(binary.NativeEndian.Uint32(buf[offset+12:]))
+				nameStart := offset + syscall.SizeofInotifyEvent
+				name := strings.TrimRight(string(buf[nameStart:nameStart+nameLen]), "\x00")
+				offset = nameStart + nameLen
+
+				if names[wd][name] {
+					// Coalesce bursts; the watch loop re-checks mtime anyway
+					select {
+					case events <- struct{}{}:
+					default:
+					}
+				}
+			}
+		}
+	}()
+
+	return events, func() { file.Close() }, nil
+}
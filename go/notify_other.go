@@ -0,0 +1,10 @@
+//go:build !linux
+
+package main
+
+import "errors"
+
+// newFileNotifier is only implemented on Linux; callers fall back to polling.
+func newFileNotifier(paths []string) (<-chan struct{}, func(), error) {
+	return nil, nil, errors.New("file change notifications not supported on this platform")
+}